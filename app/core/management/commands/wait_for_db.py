@@ -3,9 +3,26 @@
 """
 import time
 
+import psycopg
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.db.utils import OperationalError
-from psycopg import OperationalError as PsycopgOperationalError
+
+INITIAL_DELAY = 0.1
+MAX_DELAY = 5.0
+CONNECT_TIMEOUT = 2
+
+
+def probe_database():
+    """Open and close a connection to the default database."""
+    db = settings.DATABASES["default"]
+    psycopg.connect(
+        host=db["HOST"],
+        port=db.get("PORT"),
+        user=db["USER"],
+        password=db["PASSWORD"],
+        dbname=db["NAME"],
+        connect_timeout=CONNECT_TIMEOUT,
+    ).close()
 
 
 class Command(BaseCommand):
@@ -15,12 +32,16 @@ class Command(BaseCommand):
         """Entrypoint for command"""
         self.stdout.write("Waiting for database...")
         db_up = False
+        delay = INITIAL_DELAY
         while db_up is False:
             try:
-                self.check(databases=["default"])
+                probe_database()
                 db_up = True
-            except (PsycopgOperationalError, OperationalError):
-                self.stdout.write("Database unavailable, waiting for 1 second...")
-                time.sleep(1)
+            except psycopg.OperationalError:
+                self.stdout.write(
+                    f"Database unavailable, waiting for {delay:g} seconds..."
+                )
+                time.sleep(delay)
+                delay = min(delay * 2, MAX_DELAY)
 
         self.stdout.write(self.style.SUCCESS("Database available!"))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-15 09:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0008_recipe_image"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ingredient",
+            index=models.Index(
+                fields=["user", "-name"], name="core_ingred_user_id_344ab4_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-15 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0009_ingredient_core_ingred_user_id_344ab4_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="recipe",
+            index=models.Index(
+                fields=["user", "-id"], name="core_recipe_user_id_98373e_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(
+                fields=["user", "-name"], name="core_tag_user_id_0e0962_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-15 09:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0010_recipe_core_recipe_user_id_98373e_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recipe",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+"""
+Renderers for the APIs.
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Render JSON with orjson instead of the standard library encoder.
+
+    Unlike JSONRenderer in strict mode, NaN and infinite floats are rendered as
+    null instead of raising an error.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data into JSON, returning a bytestring."""
+
+        if data is None:
+            return b""
+
+        # let the DRF encoder format dates so output matches JSONRenderer
+        option = orjson.OPT_PASSTHROUGH_DATETIME
+        # validation errors of list and dict fields are keyed by int
+        option |= orjson.OPT_NON_STR_KEYS
+        # orjson only pretty prints with two spaces, used for any requested indent
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=option)
+
+        # keep the output a strict javascript subset, same as JSONRenderer
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
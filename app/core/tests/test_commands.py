@@ -4,34 +4,52 @@
 
 from unittest.mock import patch
 
+from core.management.commands import wait_for_db
 from django.core.management import call_command
-from django.db.utils import OperationalError
 from django.test import SimpleTestCase
 from psycopg import OperationalError as PsycopgOperationalError
 
 
-@patch("core.management.commands.wait_for_db.Command.check")
+@patch("core.management.commands.wait_for_db.psycopg.connect")
 class COmmandTests(SimpleTestCase):
     """Test Commands"""
 
-    def test_wait_for_db_ready(self, patched_check):
+    def test_wait_for_db_ready(self, patched_connect):
         """Test waiting for database if database ready."""
 
-        patched_check.return_value = True
-
         call_command("wait_for_db")
 
-        patched_check.assert_called_once_with(databases=["default"])
+        patched_connect.assert_called_once()
+        self.assertEqual(
+            patched_connect.call_args.kwargs["connect_timeout"],
+            wait_for_db.CONNECT_TIMEOUT,
+        )
+        patched_connect.return_value.close.assert_called_once_with()
 
     @patch("time.sleep")
-    def wait_for_db_delay(self, patched_sleep, patched_check):
+    def test_wait_for_db_delay(self, patched_sleep, patched_connect):
         """Test waiting for database when getting OperationalError."""
 
-        patched_check.side_effect = (
-            [PsycopgOperationalError] * 2 + [OperationalError] * 3 + [True]
+        patched_connect.side_effect = [PsycopgOperationalError] * 5 + [
+            patched_connect.return_value
+        ]
+
+        call_command("wait_for_db")
+
+        self.assertEqual(patched_connect.call_count, 6)
+        self.assertEqual(
+            [c.args[0] for c in patched_sleep.call_args_list],
+            [0.1, 0.2, 0.4, 0.8, 1.6],
         )
 
+    @patch("time.sleep")
+    def test_wait_for_db_delay_capped(self, patched_sleep, patched_connect):
+        """Test the delay between retries stops growing at the maximum."""
+
+        patched_connect.side_effect = [PsycopgOperationalError] * 8 + [
+            patched_connect.return_value
+        ]
+
         call_command("wait_for_db")
 
-        self.assertEqual(patched_check.call_count, 6)
-        patched_check.assert_called_with(databases=["default"])
+        self.assertEqual(patched_sleep.call_args_list[-1].args[0], 5.0)
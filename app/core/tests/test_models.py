@@ -23,7 +23,7 @@ class ModelTests(TestCase):
         password = "testpass123"
         user = get_user_model().objects.create_user(email=email, password=password)
         self.assertEqual(user.email, email)
-        self.assertTrue(user.check_password, password)
+        self.assertTrue(user.check_password(password))
 
     def test_new_user_email_normalized(self):
         """Test email is normalized for new users."""
@@ -0,0 +1,60 @@
+"""
+    Tests for API renderers
+"""
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from core.renderers import ORJSONRenderer
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    """Test the orjson backed renderer."""
+
+    def test_render_matches_json_renderer(self):
+        """Test rendering produces the same document as JSONRenderer."""
+
+        data = {
+            "id": 1,
+            "title": "Sample recipe",
+            "price": Decimal("5.35"),
+            "updated_at": datetime(2023, 6, 17, 19, 34, tzinfo=timezone.utc),
+            "detail": gettext_lazy("Not found."),
+            "tags": [{"id": 1, "name": "vegan"}],
+            "errors": {"tags": {0: ["This field is required."]}},
+        }
+
+        rendered = ORJSONRenderer().render(data)
+
+        self.assertEqual(json.loads(rendered), json.loads(JSONRenderer().render(data)))
+
+    def test_render_non_finite_floats(self):
+        """Test NaN and infinity render as null."""
+
+        rendered = ORJSONRenderer().render([float("nan"), float("inf")])
+
+        self.assertEqual(rendered, b"[null,null]")
+
+    def test_render_none(self):
+        """Test rendering no data returns an empty body."""
+
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_render_escapes_line_separators(self):
+        """Test U+2028 and U+2029 are escaped like JSONRenderer does."""
+
+        rendered = ORJSONRenderer().render({"name": "a\u2028b\u2029c"})
+
+        self.assertEqual(rendered, b'{"name":"a\\u2028b\\u2029c"}')
+
+    def test_render_indent(self):
+        """Test an indent in the accepted media type pretty prints."""
+
+        rendered = ORJSONRenderer().render(
+            {"id": 1}, accepted_media_type="application/json; indent=4"
+        )
+
+        self.assertEqual(rendered, b'{\n  "id": 1\n}')
@@ -35,23 +35,31 @@ class RecipeSerializer(serializers.ModelSerializer):
         fields = ["id", "title", "time_minutes", "price", "link", "tags", "ingredients"]
         read_only_fields = ["id"]
 
+    def _get_or_create_by_name(self, model, items):
+        """Get or create the user's objects named in items, in payload order."""
+
+        auth_user = self.context["request"].user
+        names = list(dict.fromkeys(item["name"] for item in items))
+        objs = {
+            obj.name: obj
+            for obj in model.objects.filter(user=auth_user, name__in=names)
+        }
+        created = model.objects.bulk_create(
+            [model(user=auth_user, name=name) for name in names if name not in objs]
+        )
+        objs.update((obj.name, obj) for obj in created)
+
+        return [objs[name] for name in names]
+
     def _get_or_create_tags(self, tags, recipe):
         """Get or create tags."""
 
-        auth_user = self.context["request"].user
-        for tag in tags:
-            tag_obj, _ = Tag.objects.get_or_create(user=auth_user, **tag)
-            recipe.tags.add(tag_obj)
+        recipe.tags.add(*self._get_or_create_by_name(Tag, tags))
 
     def _get_or_create_ingredients(self, ingredients, recipe):
         """Get or create ingredients."""
 
-        auth_user = self.context["request"].user
-        for ingredient in ingredients:
-            ingredient_obj, _ = Ingredient.objects.get_or_create(
-                user=auth_user, **ingredient
-            )
-            recipe.ingredients.add(ingredient_obj)
+        recipe.ingredients.add(*self._get_or_create_by_name(Ingredient, ingredients))
 
     def create(self, validated_data):
         """Create a new recipe."""
@@ -89,7 +97,6 @@ class RecipeDetailSerializer(RecipeSerializer):
 
     class Meta(RecipeSerializer.Meta):
         fields = RecipeSerializer.Meta.fields + ["description", "image"]
-        read_only_fields = RecipeSerializer.Meta.read_only_fields
 
 
 class RecipeImageSerializer(serializers.ModelSerializer):
@@ -0,0 +1,17 @@
+"""
+Signal handlers for recipe APIs.
+"""
+from core.models import Ingredient, Tag
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+def touch_recipes_on_save(sender, instance, created, raw, **kwargs):
+    """Mark the recipes using an updated tag or ingredient as changed."""
+
+    # a new object is not used by any recipe yet, and fixtures are loaded as is
+    if not created and not raw:
+        instance.recipe_set.update(updated_at=timezone.now())
@@ -2,7 +2,6 @@
 Test the ingredients API
 """
 
-
 from core.models import Ingredient
 from django.contrib.auth import get_user_model
 from django.test import TestCase
@@ -12,6 +11,9 @@ from rest_framework import status
 from rest_framework.test import APIClient
 
 INGREDIENTS_URL = reverse("recipe:ingredient-list")
+INGREDIENT_DETAIL_PREFIX = reverse("recipe:ingredient-detail", args=[0]).removesuffix(
+    "0/"
+)
 
 
 def create_user(email="user@example.com", password="testpass"):
@@ -21,14 +23,13 @@ def create_user(email="user@example.com", password="testpass"):
 
 def detail_url(ingredient_id):
     """Helper function to return ingredient detail URL"""
-    return reverse("recipe:ingredient-detail", args=[ingredient_id])
+    return f"{INGREDIENT_DETAIL_PREFIX}{ingredient_id}/"
 
 
 class PublicIngredientsApiTests(TestCase):
     """Tests the publicly available ingredients API"""
 
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_auth_required(self):
         """Test authentication is required"""
@@ -41,20 +42,28 @@ class PublicIngredientsApiTests(TestCase):
 class PrivateIngredientsApiTests(TestCase):
     """Test the private ingredients API"""
 
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def setUp(self):
-        self.client = APIClient()
-        self.user = create_user()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_ingredients_list(self):
         """Test retrieving a list of ingredients"""
 
-        Ingredient.objects.create(user=self.user, name="Kale")
-        Ingredient.objects.create(user=self.user, name="Salt")
+        Ingredient.objects.bulk_create(
+            [
+                Ingredient(user=self.user, name="Kale"),
+                Ingredient(user=self.user, name="Salt"),
+            ]
+        )
 
         res = self.client.get(INGREDIENTS_URL)
 
-        ingredients = Ingredient.objects.all().order_by("-name")
+        ingredients = Ingredient.objects.filter(user=self.user).order_by("-name")
         serializer = IngredientSerializer(ingredients, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -1,26 +1,42 @@
 """
     Test for Recipe APIs
 """
-import os
-import tempfile
+import io
 from decimal import Decimal
 
 from core.models import Ingredient, Recipe, Tag
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from PIL import Image
-from recipe.serializers import RecipeDetailSerializer, RecipeSerializer
+from recipe.serializers import RecipeDetailSerializer
+from recipe.views import RecipeViewSet
 from rest_framework import status
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
 
 RECIPES_URL = reverse("recipe:recipe-list")
+# detail URLs only differ by the trailing id
+RECIPE_DETAIL_PREFIX = reverse("recipe:recipe-detail", args=[0]).removesuffix("0/")
+
+request_factory = APIRequestFactory()
+recipe_list_view = RecipeViewSet.as_view({"get": "list"})
+recipe_detail_view = RecipeViewSet.as_view({"get": "retrieve"})
+
+RECIPE_DEFAULTS = {
+    "title": "Sample recipe",
+    "time_minutes": 10,
+    "price": Decimal("5.35"),
+    "description": "Sample description",
+    "link": "https://sample.com/recipe",
+}
 
 
 def detail_url(recipe_id):
     """Create and return a recipe detail URL."""
 
-    return reverse("recipe:recipe-detail", args=[recipe_id])
+    return f"{RECIPE_DETAIL_PREFIX}{recipe_id}/"
 
 
 def image_upload_url(recipe_id):
@@ -28,22 +44,44 @@ def image_upload_url(recipe_id):
     return reverse("recipe:recipe-upload-image", args=[recipe_id])
 
 
+def build_recipe(user, **params):
+    """Build and return an unsaved sample recipe."""
+
+    return Recipe(user=user, **{**RECIPE_DEFAULTS, **params})
+
+
 def create_recipe(user, **params):
     """Create and return a sample recipe."""
 
-    defaults = {
-        "title": "Sample recipe",
-        "time_minutes": 10,
-        "price": Decimal("5.35"),
-        "description": "Sample description",
-        "link": "https://sample.com/recipe",
-    }
-    defaults.update(params)
-
-    recipe = Recipe.objects.create(user=user, **defaults)
+    recipe = build_recipe(user, **params)
+    recipe.save()
     return recipe
 
 
+def create_recipes(user, count, **params):
+    """Create and return several sample recipes with a single INSERT."""
+
+    return Recipe.objects.bulk_create(
+        [build_recipe(user, **params) for _ in range(count)]
+    )
+
+
+def expected_recipe(recipe, tags=(), ingredients=()):
+    """Return the list representation expected for a recipe."""
+
+    return {
+        "id": recipe.id,
+        "title": recipe.title,
+        "time_minutes": recipe.time_minutes,
+        "price": f"{recipe.price:.2f}",
+        "link": recipe.link,
+        "tags": [{"id": tag.id, "name": tag.name} for tag in tags],
+        "ingredients": [
+            {"id": ingredient.id, "name": ingredient.name} for ingredient in ingredients
+        ],
+    }
+
+
 def create_user(**params):
     """Create and return a sample user."""
 
@@ -53,8 +91,7 @@ def create_user(**params):
 class PublicRecipeAPITests(TestCase):
     """Test unauthenticated recipe API access."""
 
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_auth_required(self):
         """Test auth is required to access the endpoint."""
@@ -67,24 +104,42 @@ class PublicRecipeAPITests(TestCase):
 class PrivateRecipeAPITests(TestCase):
     """Test authenticated recipe API access."""
 
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(email="user@example.com", password="test123")
+
     def setUp(self):
-        self.client = APIClient()
-        self.user = create_user(email="user@example.com", password="test123")
         self.client.force_authenticate(self.user)
 
+    def call_view(self, view, url, **kwargs):
+        """Call a recipe view directly, skipping middleware and URL routing."""
+
+        request = request_factory.get(url)
+        force_authenticate(request, user=self.user)
+        return view(request, **kwargs)
+
+    def assert_user_has_names(self, model, items):
+        """Assert the user owns an object of model for each item name."""
+
+        names = {item["name"] for item in items}
+        objs = model.objects.filter(user=self.user, name__in=names)
+        self.assertEqual(set(objs.values_list("name", flat=True)), names)
+
     def test_retrieve_recipes(self):
         """Test retrieving a list of recipes."""
 
-        create_recipe(user=self.user)
-        create_recipe(user=self.user)
-
-        res = self.client.get(RECIPES_URL)
+        recipes = create_recipes(user=self.user, count=2)
 
-        recipes = Recipe.objects.all().order_by("-id")
-        serializer = RecipeSerializer(recipes, many=True)
+        res = self.call_view(recipe_list_view, RECIPES_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["count"], 2)
+        self.assertEqual(
+            res.data["results"],
+            [expected_recipe(recipe) for recipe in reversed(recipes)],
+        )
 
     def test_recipe_limited_to_user(self):
         """Test retrieving recipes limited to user."""
@@ -92,15 +147,121 @@ class PrivateRecipeAPITests(TestCase):
         other_user = create_user(email="user2@example.com", password="test123")
         create_recipe(user=other_user)
 
+        recipe = create_recipe(user=self.user)
+
+        res = self.call_view(recipe_list_view, RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], [expected_recipe(recipe)])
+
+    def test_retrieve_recipes_paginated(self):
+        """Test listing recipes returns one page at a time."""
+
+        recipes = create_recipes(user=self.user, count=3)
+
+        res = self.call_view(recipe_list_view, f"{RECIPES_URL}?limit=1&offset=1")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 3)
+        self.assertEqual(res.data["results"], [expected_recipe(recipes[1])])
+
+    def test_retrieve_recipes_num_queries(self):
+        """Test listing recipes nests tags and ingredients without per-recipe queries."""
+
+        recipes = create_recipes(user=self.user, count=5)
+        tags = Tag.objects.bulk_create(
+            [Tag(user=self.user, name=f"tag{i}") for i in range(2 * len(recipes))]
+        )
+        ingredients = Ingredient.objects.bulk_create(
+            [Ingredient(user=self.user, name=f"ingredient{i}") for i in range(5)]
+        )
+        for i, recipe in enumerate(recipes):
+            recipe.tags.add(*tags[2 * i : 2 * i + 2])
+            recipe.ingredients.add(ingredients[i])
+
+        with self.assertNumQueries(5):
+            res = self.call_view(recipe_list_view, RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data["results"],
+            [
+                expected_recipe(
+                    recipe,
+                    tags=tags[2 * i : 2 * i + 2],
+                    ingredients=[ingredients[i]],
+                )
+                for i, recipe in reversed(list(enumerate(recipes)))
+            ],
+        )
+
+    def test_retrieve_recipes_skips_detail_columns(self):
+        """Test listing recipes does not load detail-only columns."""
+
         create_recipe(user=self.user)
 
+        with CaptureQueriesContext(connection) as queries:
+            self.call_view(recipe_list_view, RECIPES_URL)
+
+        for query in queries.captured_queries:
+            self.assertNotIn("description", query["sql"])
+            self.assertNotIn("image", query["sql"])
+
+    def test_retrieve_recipes_not_modified(self):
+        """Test listing unchanged recipes with a matching ETag returns 304."""
+
+        create_recipe(user=self.user)
         res = self.client.get(RECIPES_URL)
 
-        recipes = Recipe.objects.filter(user=self.user)
-        serializer = RecipeSerializer(recipes, many=True)
+        self.assertIn("Authorization", res["Vary"])
+        self.assertTrue(res["ETag"].startswith('W/"'))
+        with self.assertNumQueries(1):
+            res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=res["ETag"])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_recipes_etag_changes(self):
+        """Test the list ETag changes when recipes or their tags change."""
+
+        tag = Tag.objects.create(user=self.user, name="Vegan")
+        recipe = create_recipe(user=self.user)
+        recipe.tags.add(tag)
+        etags = [self.client.get(RECIPES_URL)["ETag"]]
+
+        self.client.patch(detail_url(recipe.id), {"title": "New title"})
+        etags.append(self.client.get(RECIPES_URL)["ETag"])
+
+        self.client.patch(
+            reverse("recipe:tag-detail", args=[tag.id]), {"name": "Vegetarian"}
+        )
+        etags.append(self.client.get(RECIPES_URL)["ETag"])
+
+        self.client.delete(detail_url(recipe.id))
+        etags.append(self.client.get(RECIPES_URL)["ETag"])
+
+        self.assertEqual(len(set(etags)), len(etags))
+
+    def test_retrieve_recipes_etag_changes_outside_api(self):
+        """Test the list ETag changes when tags change outside the API."""
+
+        tag = Tag.objects.create(user=self.user, name="Vegan")
+        recipe = create_recipe(user=self.user)
+        recipe.tags.add(tag)
+
+        etag = self.client.get(RECIPES_URL)["ETag"]
+        tag.name = "Vegetarian"
+        tag.save()
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["tags"][0]["name"], "Vegetarian")
+
+        etag = res["ETag"]
+        recipe.tags.add(Tag.objects.create(user=self.user, name="Dessert"))
+        recipe.save()
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
 
     def test_get_recipe_detail(self):
         """Test get recipe detail."""
@@ -108,7 +269,8 @@ class PrivateRecipeAPITests(TestCase):
         recipe = create_recipe(user=self.user)
 
         url = detail_url(recipe.id)
-        res = self.client.get(url)
+        with self.assertNumQueries(3):
+            res = self.call_view(recipe_detail_view, url, pk=recipe.id)
 
         serializer = RecipeDetailSerializer(recipe)
 
@@ -130,7 +292,7 @@ class PrivateRecipeAPITests(TestCase):
         for key, value in payload.items():
             self.assertEqual(getattr(recipe, key), value)
 
-        self.assertEqual(recipe.user, self.user)
+        self.assertEqual(recipe.user_id, self.user.id)
 
     def test_partial_update(self):
         """Test updating a recipe with patch."""
@@ -151,7 +313,7 @@ class PrivateRecipeAPITests(TestCase):
 
         self.assertEqual(recipe.title, payload["title"])
         self.assertEqual(recipe.link, original_link)
-        self.assertEqual(recipe.user, self.user)
+        self.assertEqual(recipe.user_id, self.user.id)
 
     def test_full_update(self):
         """Test updating a recipe with put."""
@@ -178,7 +340,7 @@ class PrivateRecipeAPITests(TestCase):
 
         for k, v in payload.items():
             self.assertEqual(getattr(recipe, k), v)
-        self.assertEqual(recipe.user, self.user)
+        self.assertEqual(recipe.user_id, self.user.id)
 
     def test_update_user_returns_error(self):
         """Test updating user returns error."""
@@ -193,7 +355,7 @@ class PrivateRecipeAPITests(TestCase):
         self.client.patch(url, payload)
 
         recipe.refresh_from_db()
-        self.assertEqual(recipe.user, self.user)
+        self.assertEqual(recipe.user_id, self.user.id)
 
     def test_delete_recipe(self):
         """Test deleting a recipe."""
@@ -211,7 +373,8 @@ class PrivateRecipeAPITests(TestCase):
         recipe = create_recipe(user=other_user)
 
         url = detail_url(recipe.id)
-        res = self.client.delete(url)
+        with self.assertNumQueries(1):
+            res = self.client.delete(url)
 
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
         self.assertTrue(Recipe.objects.filter(id=recipe.id).exists())
@@ -226,15 +389,14 @@ class PrivateRecipeAPITests(TestCase):
             "tags": [{"name": "vegan"}, {"name": "dessert"}],
         }
 
-        res = self.client.post(RECIPES_URL, payload, format="json")
+        with self.assertNumQueries(6):
+            res = self.client.post(RECIPES_URL, payload, format="json")
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         recipe = Recipe.objects.get(id=res.data["id"])
 
         self.assertEqual(recipe.tags.count(), 2)
-        for tag in payload["tags"]:
-            exists = Tag.objects.filter(name=tag["name"], user=self.user).exists()
-            self.assertTrue(exists)
+        self.assert_user_has_names(Tag, payload["tags"])
 
     def test_create_recipe_with_existing_tag(self):
         """Test creating a recipe with existing tag."""
@@ -256,9 +418,7 @@ class PrivateRecipeAPITests(TestCase):
         self.assertEqual(recipe.tags.count(), 2)
         self.assertIn(tag_indian, recipe.tags.all())
 
-        for tag in payload["tags"]:
-            exists = Tag.objects.filter(name=tag["name"], user=self.user).exists()
-            self.assertTrue(exists)
+        self.assert_user_has_names(Tag, payload["tags"])
 
     def test_create_recipe_with_new_tag(self):
         """Test creating a recipe with new tag."""
@@ -274,15 +434,14 @@ class PrivateRecipeAPITests(TestCase):
         self.assertEqual(Recipe.objects.count(), 1)
         self.assertEqual(Tag.objects.count(), 2)
 
-        for tag in payload["tags"]:
-            exists = Tag.objects.filter(name=tag["name"], user=self.user).exists()
-            self.assertTrue(exists)
+        self.assert_user_has_names(Tag, payload["tags"])
 
     def test_create_recipe_with_existing_tags(self):
         """Test creating a recipe with existing tags."""
 
-        tag_vegan = Tag.objects.create(user=self.user, name="vegan")
-        tag_dessert = Tag.objects.create(user=self.user, name="dessert")
+        tag_vegan, tag_dessert = Tag.objects.bulk_create(
+            [Tag(user=self.user, name=name) for name in ("vegan", "dessert")]
+        )
         payload = {
             "title": "Chocolate cheesecake",
             "time_minutes": 30,
@@ -295,9 +454,23 @@ class PrivateRecipeAPITests(TestCase):
         self.assertEqual(Recipe.objects.count(), 1)
         self.assertEqual(Tag.objects.count(), 2)
 
-        for tag in payload["tags"]:
-            exists = Tag.objects.filter(name=tag["name"], user=self.user).exists()
-            self.assertTrue(exists)
+        self.assert_user_has_names(Tag, payload["tags"])
+
+    def test_create_recipe_with_duplicate_tags(self):
+        """Test repeated tag names in the payload create a single tag."""
+
+        payload = {
+            "title": "Chocolate cheesecake",
+            "time_minutes": 30,
+            "price": Decimal("5.30"),
+            "tags": [{"name": "vegan"}, {"name": "vegan"}],
+        }
+        res = self.client.post(RECIPES_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 1)
+        recipe = Recipe.objects.get(id=res.data["id"])
+        self.assertEqual(recipe.tags.count(), 1)
 
     def test_create_tag_on_update(self):
         """Test creating a tag on update."""
@@ -315,15 +488,17 @@ class PrivateRecipeAPITests(TestCase):
     def test_update_recipe_assign_tag(self):
         """Assigning an existing tag to a recipe."""
 
-        tag_vegan = Tag.objects.create(user=self.user, name="vegan")
+        tag_vegan, tag_lunch = Tag.objects.bulk_create(
+            [Tag(user=self.user, name=name) for name in ("vegan", "lunch")]
+        )
         recipe = create_recipe(user=self.user)
 
         recipe.tags.add(tag_vegan)
 
-        tag_lunch = Tag.objects.create(user=self.user, name="lunch")
         payload = {"tags": [{"name": "lunch"}]}
         url = detail_url(recipe.id)
-        res = self.client.patch(url, payload, format="json")
+        with self.assertNumQueries(7):
+            res = self.client.patch(url, payload, format="json")
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertIn(tag_lunch, recipe.tags.all())
@@ -360,17 +535,14 @@ class PrivateRecipeAPITests(TestCase):
             ],
         }
 
-        res = self.client.post(RECIPES_URL, payload, format="json")
+        with self.assertNumQueries(6):
+            res = self.client.post(RECIPES_URL, payload, format="json")
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         recipe = Recipe.objects.get(id=res.data["id"], user=self.user)
         self.assertEqual(recipe.ingredients.count(), 2)
 
-        for ingredient in payload["ingredients"]:
-            exists = Ingredient.objects.filter(
-                name=ingredient["name"], user=self.user
-            ).exists()
-            self.assertTrue(exists)
+        self.assert_user_has_names(Ingredient, payload["ingredients"])
 
     def test_create_recipe_with_existing_ingredients(self):
         """Test creating recipe with existing ingredients."""
@@ -392,6 +564,22 @@ class PrivateRecipeAPITests(TestCase):
         self.assertEqual(recipe.ingredients.count(), 2)
         self.assertIn(ingredient, recipe.ingredients.all())
 
+    def test_create_recipe_with_duplicate_ingredients(self):
+        """Test repeated ingredient names in the payload create one ingredient."""
+
+        payload = {
+            "title": "Tacos",
+            "time_minutes": 20,
+            "price": Decimal("5.00"),
+            "ingredients": [{"name": "Salt"}, {"name": "Salt"}],
+        }
+        res = self.client.post(RECIPES_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Ingredient.objects.filter(user=self.user).count(), 1)
+        recipe = Recipe.objects.get(id=res.data["id"])
+        self.assertEqual(recipe.ingredients.count(), 1)
+
     def test_create_ingredient_when_update(self):
         """Test creating an ingredient when updating a recipe"""
 
@@ -412,12 +600,12 @@ class PrivateRecipeAPITests(TestCase):
     def test_update_recipe_assign_ingredient(self):
         """Test assigning an existing ingredient to a recipe"""
 
-        ingredient1 = Ingredient.objects.create(user=self.user, name="Tortilla")
+        ingredient1, ingredient2 = Ingredient.objects.bulk_create(
+            [Ingredient(user=self.user, name=name) for name in ("Tortilla", "Meat")]
+        )
         recipe = create_recipe(user=self.user)
         recipe.ingredients.add(ingredient1)
 
-        ingredient2 = Ingredient.objects.create(user=self.user, name="Meat")
-
         payload = {
             "ingredients": [
                 {"name": "Meat"},
@@ -446,35 +634,44 @@ class PrivateRecipeAPITests(TestCase):
         self.assertEqual(recipe.ingredients.count(), 0)
 
 
+@override_settings(
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
+)
 class ImageUploadTests(TestCase):
     """Test image upload"""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
             "user@example.com", "password123"
         )
-        self.client.force_authenticate(self.user)
-        self.recipe = create_recipe(user=self.user)
+        cls.recipe = create_recipe(user=cls.user)
 
-    def tearDown(self):
-        self.recipe.image.delete()
+    def setUp(self):
+        self.client.force_authenticate(self.user)
 
     def test_upload_image_to_recipe(self):
         """Test uploading an image to recipe"""
 
         url = image_upload_url(self.recipe.id)
-        with tempfile.NamedTemporaryFile(suffix=".jpg") as image_file:
-            image = Image.new("RGB", (10, 10))
-            image.save(image_file, format="JPEG")
-            image_file.seek(0)
+        image_file = io.BytesIO()
+        image_file.name = "test.jpg"
+        Image.new("RGB", (10, 10)).save(image_file, format="JPEG")
+        image_file.seek(0)
 
-            res = self.client.post(url, {"image": image_file}, format="multipart")
+        res = self.client.post(url, {"image": image_file}, format="multipart")
 
         self.recipe.refresh_from_db()
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertIn("image", res.data)
-        self.assertTrue(os.path.exists(self.recipe.image.path))
+        self.assertTrue(self.recipe.image.storage.exists(self.recipe.image.name))
 
     def test_upload_image_bad_request(self):
         """Test uploading an invalid image"""
@@ -2,7 +2,6 @@
 Tests for the tags aps
 """
 
-
 from core.models import Tag
 from django.contrib.auth import get_user_model
 from django.test import TestCase
@@ -12,6 +11,7 @@ from rest_framework import status
 from rest_framework.test import APIClient
 
 TAGS_URL = reverse("recipe:tag-list")
+TAG_DETAIL_PREFIX = reverse("recipe:tag-detail", args=[0]).removesuffix("0/")
 
 
 def create_user(email="user@example.com", password="testpass123"):
@@ -21,14 +21,13 @@ def create_user(email="user@example.com", password="testpass123"):
 
 def detail_url(tag_id):
     """Return recipe detail URL."""
-    return reverse("recipe:tag-detail", args=[tag_id])
+    return f"{TAG_DETAIL_PREFIX}{tag_id}/"
 
 
 class PublicTagsAPITests(TestCase):
     """Test unauthenticated tags API access."""
 
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_auth_required(self):
         """Test that authentication is required."""
@@ -41,16 +40,21 @@ class PublicTagsAPITests(TestCase):
 class PrivateTagsAPITests(TestCase):
     """Test the authorized user tags API."""
 
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def setUp(self):
-        self.user = create_user()
-        self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_tags(self):
         """Test retrieving tags."""
 
-        Tag.objects.create(user=self.user, name="Vegan")
-        Tag.objects.create(user=self.user, name="Dessert")
+        Tag.objects.bulk_create(
+            [Tag(user=self.user, name=name) for name in ("Vegan", "Dessert")]
+        )
 
         res = self.client.get(TAGS_URL)
 
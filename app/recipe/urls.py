@@ -4,9 +4,9 @@ URLs mapping for the recipe api.
 
 from django.urls import include, path
 from recipe import views
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 
-router = DefaultRouter()
+router = SimpleRouter()
 
 router.register("recipe", views.RecipeViewSet)
 router.register("tags", views.TagViewSet)
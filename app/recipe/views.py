@@ -4,14 +4,45 @@ Views for recipe APIs
 
 
 from core.models import Ingredient, Recipe, Tag
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import etag
+from django.views.decorators.vary import vary_on_headers
 from recipe import serializers
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 
+def recipe_list_etag(request, *args, **kwargs):
+    """Return an ETag that changes whenever the user's recipes change.
+
+    Tag and ingredient edits bump Recipe.updated_at through recipe.signals, but
+    linking or unlinking them does not: code doing so outside the serializers
+    must save the recipe afterwards.
+    """
+    recipes = Recipe.objects.filter(user=request.user).aggregate(
+        count=Count("id"), updated_at=Max("updated_at")
+    )
+    updated_at = recipes["updated_at"]
+
+    # weak, since the JSON and browsable API renderings share the same tag
+    return f'W/"{recipes["count"]}-{updated_at.timestamp() if updated_at else 0}"'
+
+
+class RecipePagination(LimitOffsetPagination):
+    """Paginate recipe lists so each request serializes a bounded page."""
+
+    default_limit = 25
+    max_limit = 100
+
+
+@method_decorator(vary_on_headers("Authorization"), name="list")
+@method_decorator(etag(recipe_list_etag), name="list")
 class RecipeViewSet(viewsets.ModelViewSet):
     """Manage recipe APIs."""
 
@@ -19,10 +50,24 @@ class RecipeViewSet(viewsets.ModelViewSet):
     queryset = Recipe.objects.all()
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = RecipePagination
+    # columns read by RecipeSerializer, the only ones loaded when listing
+    list_fields = ["id", "title", "time_minutes", "price", "link"]
 
     def get_queryset(self):
         """Retrieve the recipes for the authenticated user."""
-        return self.queryset.filter(user=self.request.user).order_by("-id")
+        queryset = self.queryset.filter(user=self.request.user)
+
+        # writes refetch the relations after saving, so only reads prefetch them
+        if self.action in ("list", "retrieve"):
+            queryset = queryset.prefetch_related("tags", "ingredients")
+
+        # ordering only matters for lists; single object lookups go by primary key
+        if self.action == "list":
+            queryset = queryset.order_by("-id")
+            queryset = queryset.only(*self.list_fields)
+
+        return queryset
 
     def get_serializer_class(self):
         """Return the serializer class for request."""
@@ -66,7 +111,18 @@ class BaseRecipeAttrViewSet(
 
     def get_queryset(self):
         """Filter queryset by authenticated user."""
-        return self.queryset.filter(user=self.request.user).order_by("-name")
+        queryset = self.queryset.filter(user=self.request.user)
+
+        # as for recipes, only lists need ordering
+        if self.action == "list":
+            queryset = queryset.order_by("-name")
+
+        return queryset
+
+    def perform_destroy(self, instance):
+        """Mark the recipes using the object as changed, then delete it."""
+        instance.recipe_set.update(updated_at=timezone.now())
+        instance.delete()
 
 
 class TagViewSet(BaseRecipeAttrViewSet):